@@ -10,7 +10,8 @@ from config import SAMPLE_RATE, CHUNK_SIZE, LOOKBACK_FRAMES
 
 class StreamingAudioWriter:
     def __init__(self, player, output_file, sample_rate=SAMPLE_RATE,
-                 chunk_size=CHUNK_SIZE, lookback_frames=LOOKBACK_FRAMES):
+                 chunk_size=CHUNK_SIZE, lookback_frames=LOOKBACK_FRAMES,
+                 on_chunk=None, output_dtype=None):
         """
         Sliding window decoder with lookback context.
 
@@ -20,12 +21,20 @@ class StreamingAudioWriter:
             sample_rate: Audio sample rate (22050 Hz for nanocodec)
             chunk_size: Number of NEW frames to output per iteration
             lookback_frames: Number of frames to include from previous context for continuity
+            on_chunk: Optional callable that takes ownership of each decoded
+                chunk; called from the decoder thread instead of appending
+                to audio_chunks, so the consumer controls accumulation
+            output_dtype: Optional np.int16 to emit PCM chunks instead of
+                the decoder's floats; converting at production time halves
+                memory traffic for every downstream stage
         """
         self.player = player
         self.output_file = output_file
         self.sample_rate = sample_rate
         self.chunk_size = chunk_size
         self.lookback_frames = lookback_frames
+        self.on_chunk = on_chunk
+        self.output_dtype = output_dtype
         self.token_queue = queue.Queue()
         self.audio_chunks = []
         self.running = True
@@ -34,6 +43,19 @@ class StreamingAudioWriter:
         self.all_tokens = []  # Store all audio tokens for sliding window decoding
         self.frames_decoded = 0  # Track how many frames we've already output
 
+    def _convert(self, chunk):
+        """Cast a decoded chunk to the configured output dtype.
+
+        Scale, round and clip in one float32 pass, then cast; also releases
+        the view into the decoder's full output buffer.
+        """
+        if self.output_dtype is None or chunk.dtype == self.output_dtype:
+            return chunk
+        scaled = np.multiply(chunk, 32767.0, dtype=np.float32)
+        np.rint(scaled, out=scaled)
+        np.clip(scaled, -32768.0, 32767.0, out=scaled)
+        return scaled.astype(self.output_dtype, copy=False)
+
     def decoder_worker(self):
         """Background thread that decodes audio chunks as they arrive"""
         speech_ended = False
@@ -79,9 +101,12 @@ class StreamingAudioWriter:
                                 # Skip lookback portion, only save new frames
                                 lookback_skip = min(self.frames_decoded, self.lookback_frames)
                                 skip_samples = lookback_skip * samples_per_frame
-                                new_audio = audio_chunk[skip_samples:]
+                                new_audio = self._convert(audio_chunk[skip_samples:])
 
-                                self.audio_chunks.append(new_audio)
+                                if self.on_chunk is not None:
+                                    self.on_chunk(new_audio)
+                                else:
+                                    self.audio_chunks.append(new_audio)
                                 print(f"[DECODER] Final chunk: {remaining_frames} frames ({remaining_frames/12.5:.2f}s audio)")
 
                     self.inside_speech = False
@@ -119,9 +144,12 @@ class StreamingAudioWriter:
 
                             # Extract only the new chunk_size frames worth of audio
                             new_samples = self.chunk_size * samples_per_frame
-                            new_audio = audio_chunk[skip_samples:skip_samples + new_samples]
+                            new_audio = self._convert(audio_chunk[skip_samples:skip_samples + new_samples])
 
-                            self.audio_chunks.append(new_audio)
+                            if self.on_chunk is not None:
+                                self.on_chunk(new_audio)
+                            else:
+                                self.audio_chunks.append(new_audio)
                             self.frames_decoded += self.chunk_size
 
                             print(f"[DECODER] Decoded {self.chunk_size} frames ({self.chunk_size/12.5:.2f}s audio) with {self.lookback_frames}-frame lookback context")
@@ -132,6 +160,26 @@ class StreamingAudioWriter:
             except queue.Empty:
                 continue
 
+    def reset(self):
+        """Return the writer to its initial state so it can be reused.
+
+        Containers are cleared in place rather than reallocated, so a
+        pooled writer serves its next request without rebuilding them.
+        Only call this after finalize() has joined the decoder thread.
+        """
+        del self.audio_chunks[:]
+        del self.audio_token_buffer[:]
+        del self.all_tokens[:]
+        while True:
+            try:
+                self.token_queue.get_nowait()
+            except queue.Empty:
+                break
+        self.running = True
+        self.inside_speech = False
+        self.frames_decoded = 0
+        self.on_chunk = None
+
     def add_token(self, token_id):
         """Add a token to the processing queue"""
         self.token_queue.put(token_id)
@@ -2,18 +2,46 @@
 """Startup script for Kani TTS WebSocket server"""
 
 import asyncio
+import atexit
+import queue
 import sys
 import logging
+from logging.handlers import QueueHandler, QueueListener
 from websocket_server import main
 
+# uvloop (winloop on Windows) replaces the default selector event loop with
+# libuv, speeding up every socket send/recv on the WebSocket hot path
+try:
+    import uvloop
+    uvloop.install()
+except ImportError:
+    try:
+        import winloop
+        winloop.install()
+    except ImportError:
+        pass
+
 def setup_logging():
-    """Setup logging configuration"""
+    """Setup logging configuration
+
+    File records go through a QueueHandler drained by a QueueListener
+    thread, so disk writes never block the event loop mid-record.
+    """
+    log_format = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+    log_queue = queue.Queue()
+    file_handler = logging.FileHandler('websocket_server.log')
+    file_handler.setFormatter(logging.Formatter(log_format))
+    listener = QueueListener(log_queue, file_handler)
+    listener.start()
+    atexit.register(listener.stop)
+
     logging.basicConfig(
         level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        format=log_format,
         handlers=[
             logging.StreamHandler(sys.stdout),
-            logging.FileHandler('websocket_server.log')
+            QueueHandler(log_queue)
         ]
     )
 
@@ -37,7 +65,12 @@ def print_banner():
 if __name__ == "__main__":
     setup_logging()
     print_banner()
-    
+
+    # The generator runs on worker threads; a longer switch interval cuts
+    # GIL hand-off churn between them and the event loop thread
+    sys.setswitchinterval(0.01)
+
+
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
@@ -3,8 +3,20 @@
 import asyncio
 import logging
 import os
+from pathlib import Path
 from websocket_client import KaniTTSClient, SpanishAITTSIntegration
 
+# Prefer the libuv-backed event loop (winloop on Windows) for faster socket I/O
+try:
+    import uvloop
+    uvloop.install()
+except ImportError:
+    try:
+        import winloop
+        winloop.install()
+    except ImportError:
+        pass
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -32,9 +44,8 @@ async def test_basic_client():
         audio_data = await client.send_tts_request(test_text)
         
         if audio_data:
-            # Save test audio
-            with open("test_basic.wav", "wb") as f:
-                f.write(audio_data)
+            # Save test audio in one write call
+            Path("test_basic.wav").write_bytes(audio_data)
             logger.info(f"✅ Basic test successful - saved {len(audio_data)} bytes to test_basic.wav")
             return True
         else:
@@ -84,8 +95,7 @@ async def test_spanish_integration():
             
             if audio_data:
                 filename = f"test_spanish_{i+1}_{emotion}.wav"
-                with open(filename, "wb") as f:
-                    f.write(audio_data)
+                Path(filename).write_bytes(audio_data)
                 logger.info(f"✅ Saved {filename} ({len(audio_data)} bytes)")
             else:
                 logger.error(f"❌ Failed to generate audio for text {i+1}")
@@ -130,7 +140,7 @@ async def test_streaming():
             logger.info(f"📦 Chunk {chunk_count}: {len(audio_bytes)} bytes, {metadata['duration']:.2f}s")
         
         logger.info("🎤 Starting streaming generation...")
-        success = await integration.stream_speech(long_text, chunk_callback=on_chunk)
+        success = await integration.stream_speech(long_text, on_chunk=on_chunk)
         
         if success:
             logger.info(f"✅ Streaming test successful - {chunk_count} chunks, {total_bytes} total bytes")
@@ -146,36 +156,39 @@ async def test_streaming():
         await integration.disconnect()
 
 
+async def _run_test(test_name, test_func):
+    """Run one test, reporting errors as failures instead of cancelling siblings"""
+    logger.info(f"Starting test: {test_name}")
+    try:
+        result = await test_func()
+    except Exception as e:
+        logger.error(f"❌ {test_name} test ERROR: {e}")
+        return False
+
+    if result:
+        logger.info(f"✅ {test_name} test PASSED")
+    else:
+        logger.error(f"❌ {test_name} test FAILED")
+    return result
+
+
 async def main():
     """Run all tests"""
     logger.info("🚀 Starting WebSocket TTS tests...")
-    
+
     tests = [
         ("Basic Client", test_basic_client),
         ("Spanish Integration", test_spanish_integration),
         ("Streaming", test_streaming)
     ]
-    
-    results = []
-    
-    for test_name, test_func in tests:
-        logger.info(f"\n{'='*50}")
-        logger.info(f"Running test: {test_name}")
-        logger.info(f"{'='*50}")
-        
-        try:
-            result = await test_func()
-            results.append((test_name, result))
-            
-            if result:
-                logger.info(f"✅ {test_name} test PASSED")
-            else:
-                logger.error(f"❌ {test_name} test FAILED")
-                
-        except Exception as e:
-            logger.error(f"❌ {test_name} test ERROR: {e}")
-            results.append((test_name, False))
-    
+
+    # Each test uses its own connection, so they run concurrently - total
+    # wall time is the slowest test instead of the sum of all three
+    async with asyncio.TaskGroup() as tg:
+        tasks = {name: tg.create_task(_run_test(name, fn)) for name, fn in tests}
+
+    results = [(name, task.result()) for name, task in tasks.items()]
+
     # Summary
     logger.info(f"\n{'='*50}")
     logger.info("TEST SUMMARY")
@@ -6,21 +6,48 @@ import asyncio
 import base64
 import json
 import logging
+from functools import lru_cache
+from pathlib import Path
 from typing import Dict, Any
 
 from websocket_client import KaniTTSClient
 from websocket_config import DEFAULT_CONFIG, WEBSOCKET_HOST, WEBSOCKET_PORT
 
+# Prefer the libuv-backed event loop (winloop on Windows) for faster socket I/O
+try:
+    import uvloop
+    uvloop.install()
+except ImportError:
+    try:
+        import winloop
+        winloop.install()
+    except ImportError:
+        pass
+
+
+@lru_cache(maxsize=None)
+def _render_prompt(prompt: str, default) -> str:
+    return f"{prompt} [{default}]: "
+
 
 def prompt_with_default(prompt: str, default: str) -> str:
-    value = input(f"{prompt} [{default}]: ").strip()
+    value = input(_render_prompt(prompt, default)).strip()
     return value if value else default
 
 
+def _strip_sign(raw: str) -> str:
+    return raw[1:] if raw[:1] in ('+', '-') else raw
+
+
 def prompt_float(prompt: str, default: float) -> float:
-    raw = input(f"{prompt} [{default}]: ").strip()
+    raw = input(_render_prompt(prompt, default)).strip()
     if not raw:
         return default
+    # str.isdecimal is a C fast path matching only digits float() accepts;
+    # plain decimals never pay for exception construction, and other forms
+    # (e.g. "1e3") fall back to float()
+    if _strip_sign(raw).replace('.', '', 1).isdecimal():
+        return float(raw)
     try:
         return float(raw)
     except ValueError:
@@ -29,9 +56,11 @@ def prompt_float(prompt: str, default: float) -> float:
 
 
 def prompt_int(prompt: str, default: int) -> int:
-    raw = input(f"{prompt} [{default}]: ").strip()
+    raw = input(_render_prompt(prompt, default)).strip()
     if not raw:
         return default
+    if _strip_sign(raw).isdecimal():
+        return int(raw)
     try:
         return int(raw)
     except ValueError:
@@ -57,26 +86,8 @@ def prompt_choice(prompt: str, choices: Dict[str, Any], default_key: str) -> Any
     return choices[default_key]
 
 
-async def run_cli() -> None:
-    logging.basicConfig(level=logging.INFO, format='%(message)s')
-    print("\nKani TTS WebSocket Test CLI\n============================\n")
-
-    # Connection settings
-    host = prompt_with_default("Server host", WEBSOCKET_HOST)
-    port = prompt_int("Server port", WEBSOCKET_PORT)
-
-    client = KaniTTSClient(host, port)
-    if not await client.connect():
-        print("Failed to connect to server. Exiting.")
-        return
-
-    # Ping
-    alive = await client.ping()
-    if not alive:
-        print("Server did not respond to ping. Exiting.")
-        await client.disconnect()
-        return
-
+def prompt_session():
+    """Collect mode, config, text and reference audio from the user"""
     # Mode
     mode = prompt_choice(
         "Mode:", {"Full (single WAV response)": "full", "Streaming (chunks)": "stream"}, "Full (single WAV response)"
@@ -93,20 +104,17 @@ async def run_cli() -> None:
 
     print("")
     text = input("Enter text to synthesize: ").strip()
-    if not text:
-        print("No text provided. Exiting.")
-        await client.disconnect()
-        return
 
     # Optional reference audio (base64 input)
-    ref_b64 = input("Optional reference audio as base64 (press Enter to skip): ").strip()
     reference_audio_bytes = None
-    if ref_b64:
-        try:
-            reference_audio_bytes = base64.b64decode(ref_b64)
-        except Exception:
-            print("Invalid base64, ignoring reference audio.")
-            reference_audio_bytes = None
+    if text:
+        ref_b64 = input("Optional reference audio as base64 (press Enter to skip): ").strip()
+        if ref_b64:
+            try:
+                reference_audio_bytes = base64.b64decode(ref_b64)
+            except Exception:
+                print("Invalid base64, ignoring reference audio.")
+                reference_audio_bytes = None
 
     config = {
         "language": language,
@@ -117,6 +125,40 @@ async def run_cli() -> None:
         "chunk_size": chunk_size,
         "lookback_frames": lookback_frames,
     }
+    return mode, config, text, reference_audio_bytes
+
+
+async def connect_and_ping(client: KaniTTSClient) -> bool:
+    """Connect and verify the server responds to ping"""
+    if not await client.connect():
+        return False
+    return await client.ping()
+
+
+async def run_cli() -> None:
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    print("\nKani TTS WebSocket Test CLI\n============================\n")
+
+    # Connection settings
+    host = prompt_with_default("Server host", WEBSOCKET_HOST)
+    port = prompt_int("Server port", WEBSOCKET_PORT)
+
+    # Establish the connection while the user is still typing config values;
+    # the prompts run in a thread so the event loop can drive the handshake
+    # concurrently, and by the time input is done the connection is ready
+    client = KaniTTSClient(host, port)
+    connect_task = asyncio.create_task(connect_and_ping(client))
+    mode, config, text, reference_audio_bytes = await asyncio.to_thread(prompt_session)
+
+    if not await connect_task:
+        print("Failed to connect to server or no ping response. Exiting.")
+        await client.disconnect()
+        return
+
+    if not text:
+        print("No text provided. Exiting.")
+        await client.disconnect()
+        return
 
     print("")
     print("Starting inference...\n")
@@ -126,8 +168,7 @@ async def run_cli() -> None:
             audio_wav = await client.send_tts_request(text, config=config, reference_audio=reference_audio_bytes)
             if audio_wav:
                 out_path = prompt_with_default("Output WAV filename", "tts_output.wav")
-                with open(out_path, "wb") as f:
-                    f.write(audio_wav)
+                Path(out_path).write_bytes(audio_wav)
                 print(f"Saved: {out_path}")
         except Exception as e:
             print(f"Error: {e}")
@@ -2,82 +2,346 @@
 
 import asyncio
 import json
-import base64
+import binascii
 import io
 import logging
-from typing import Optional, Callable, Dict, Any
+import random
+from pathlib import Path
+from typing import Optional, Callable, Dict, Any, BinaryIO
 import websockets
-from websockets.client import WebSocketClientProtocol
+
+# orjson is a C JSON codec that is 3-10x faster than the stdlib on the small
+# dicts exchanged here; it returns bytes, which websockets sends without an
+# extra str->bytes encode. Fall back to stdlib json if unavailable.
+try:
+    import orjson
+
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj):
+        return json.dumps(obj).encode("utf-8")
+
+    _loads = json.loads
+
+# picows is a Cython WebSocket implementation whose per-frame cost is a
+# fraction of websockets'; streaming delivers many small frames, so the client
+# prefers it when installed and keeps websockets as the fallback transport.
+try:
+    import picows
+except ImportError:
+    picows = None
 
 from websocket_config import (
-    WEBSOCKET_HOST, WEBSOCKET_PORT, MESSAGE_TYPES, 
-    DEFAULT_CONFIG, ERROR_MESSAGES
+    WEBSOCKET_HOST, WEBSOCKET_PORT, DEFAULT_CONFIG, ERROR_MESSAGES,
+    TTS_REQUEST, TTS_STREAM_REQUEST, TTS_RESPONSE,
+    TTS_STREAM_CHUNK, TTS_STREAM_CHUNK_BATCH, TTS_STREAM_COMPLETE, PING, PONG
 )
 
 logger = logging.getLogger(__name__)
 
+# Slice size for incremental base64 encoding; multiple of 3 so chunk
+# boundaries never produce padding mid-stream
+_B64_CHUNK = 48 * 1024
+
+
+def _encode_reference_b64(reference_audio: bytes) -> str:
+    """Base64-encode reference audio in slices via memoryview.
+
+    Encoding 48 KB at a time into a bytearray keeps peak memory at ~1.33x
+    the payload instead of the ~2.33x a whole-blob b64encode+decode costs.
+    Only used for legacy servers that predate binary reference frames.
+    """
+    mv = memoryview(reference_audio)
+    out = bytearray()
+    for i in range(0, len(mv), _B64_CHUNK):
+        out += binascii.b2a_base64(mv[i:i + _B64_CHUNK], newline=False)
+    return out.decode("ascii")
+
+
+if picows is not None:
+
+    class _PicowsListener(picows.WSListener):
+        """Pushes incoming frames into a queue drained by the client"""
+
+        def __init__(self):
+            self.messages = asyncio.Queue()
+            self._fragments = None
+            self._fragments_text = False
+
+        def on_ws_frame(self, transport, frame):
+            if frame.msg_type == picows.WSMsgType.CLOSE:
+                self.messages.put_nowait(None)
+                return
+            if frame.msg_type == picows.WSMsgType.TEXT:
+                is_text = True
+            elif frame.msg_type == picows.WSMsgType.BINARY:
+                is_text = False
+            elif frame.msg_type == picows.WSMsgType.CONTINUATION:
+                is_text = self._fragments_text
+            else:
+                return
+
+            payload = frame.get_payload_as_bytes()
+
+            # Reassemble fragmented messages before handing them out
+            if self._fragments is not None:
+                self._fragments += payload
+                if not frame.fin:
+                    return
+                payload = bytes(self._fragments)
+                self._fragments = None
+            elif not frame.fin:
+                self._fragments = bytearray(payload)
+                self._fragments_text = is_text
+                return
+
+            self.messages.put_nowait(payload.decode("utf-8") if is_text else payload)
+
+        def on_ws_disconnected(self, transport):
+            self.messages.put_nowait(None)
+
+
+    class _PicowsConnection:
+        """Minimal websockets-compatible facade over a picows transport
+
+        Exposes the send/recv/close/async-iteration surface KaniTTSClient
+        uses, so the rest of the client is transport-agnostic.
+        """
+
+        def __init__(self, transport, listener):
+            self._transport = transport
+            self._listener = listener
+
+        async def send(self, message):
+            if isinstance(message, str):
+                self._transport.send(picows.WSMsgType.TEXT, message.encode("utf-8"))
+            else:
+                self._transport.send(picows.WSMsgType.BINARY, message)
+
+        async def recv(self):
+            message = await self._listener.messages.get()
+            if message is None:
+                raise ConnectionError("Connection closed")
+            return message
+
+        async def close(self):
+            self._transport.send_close(picows.WSCloseCode.OK)
+            self._transport.disconnect()
+            await self._transport.wait_disconnected()
+
+        def __aiter__(self):
+            return self
+
+        async def __anext__(self):
+            message = await self._listener.messages.get()
+            if message is None:
+                raise StopAsyncIteration
+            return message
+
 
 class KaniTTSClient:
     """WebSocket client for Kani TTS server"""
     
-    def __init__(self, host: str = WEBSOCKET_HOST, port: int = WEBSOCKET_PORT):
+    def __init__(self, host: str = WEBSOCKET_HOST, port: int = WEBSOCKET_PORT,
+                 legacy_base64_reference: bool = False):
         self.host = host
         self.port = port
-        self.websocket: Optional[WebSocketClientProtocol] = None
+        self.websocket: Optional[Any] = None
         self.connected = False
-        
+        # Servers that predate binary reference frames need the base64 field
+        self.legacy_base64_reference = legacy_base64_reference
+        # Outgoing messages are built from reusable templates: ping is fully
+        # static so it is encoded once, and requests patch a shared dict in
+        # place instead of rebuilding the constant keys on every call
+        self._ping_bytes = _dumps({"type": PING, "data": {}})
+        self._request_template: Dict[str, Any] = {
+            "type": "",
+            "data": {"text": "", "config": None}
+        }
+        # Outgoing frames funnel through a queue drained by a writer task,
+        # so back-to-back sends are coalesced into one wakeup
+        self._send_queue: Optional[asyncio.Queue] = None
+        self._writer_task: Optional[asyncio.Task] = None
+
     async def connect(self) -> bool:
         """Connect to WebSocket server"""
         try:
+            # A reconnect can land on a client whose previous connection
+            # state is still around; drop it first so the old writer task
+            # and half-open socket are not leaked on an abandoned queue
+            if self.websocket is not None or self._writer_task is not None:
+                await self._teardown()
+
             uri = f"ws://{self.host}:{self.port}"
-            self.websocket = await websockets.connect(uri)
+            if picows is not None:
+                transport, listener = await picows.ws_connect(_PicowsListener, uri)
+                self.websocket = _PicowsConnection(transport, listener)
+            else:
+                # Audio payloads are opaque, so permessage-deflate only burns
+                # CPU; max_queue=None removes receive-side flow control that
+                # caps streaming throughput, and the size/buffer limits are
+                # raised to fit multi-MB audio responses.
+                self.websocket = await websockets.connect(
+                    uri,
+                    compression=None,
+                    max_queue=None,
+                    max_size=2**24,
+                    write_limit=2**20,
+                )
             self.connected = True
+            self._send_queue = asyncio.Queue()
+            self._writer_task = asyncio.create_task(self._send_writer())
             logger.info(f"✅ Connected to Kani TTS server at {uri}")
             return True
         except Exception as e:
             logger.error(f"❌ Failed to connect to server: {e}")
             return False
-    
+
+    async def _teardown(self) -> None:
+        """Drop connection state without flushing.
+
+        Unlike disconnect(), this never waits on the send queue - the old
+        writer may already be dead with unacked items - it cancels the
+        writer, discards whatever is still queued, and closes the socket
+        best-effort.
+        """
+        self.connected = False
+        if self._writer_task is not None:
+            self._writer_task.cancel()
+            try:
+                await self._writer_task
+            except asyncio.CancelledError:
+                pass
+            self._writer_task = None
+        if self._send_queue is not None:
+            self._drain_queue(self._send_queue)
+            self._send_queue = None
+        if self.websocket is not None:
+            try:
+                await self.websocket.close()
+            except Exception:
+                pass
+            self.websocket = None
+
+    @staticmethod
+    def _drain_queue(queue: asyncio.Queue) -> None:
+        """Discard and ack every queued frame so join() can complete"""
+        while True:
+            try:
+                queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            queue.task_done()
+
     async def disconnect(self):
         """Disconnect from WebSocket server"""
+        if self._writer_task:
+            # Let queued frames flush before tearing the connection down
+            if self._send_queue is not None:
+                await self._send_queue.join()
+            self._writer_task.cancel()
+            try:
+                await self._writer_task
+            except asyncio.CancelledError:
+                pass
+            self._writer_task = None
+            self._send_queue = None
         if self.websocket:
             await self.websocket.close()
             self.connected = False
             logger.info("🔌 Disconnected from server")
-    
-    async def send_tts_request(self, text: str, config: Optional[Dict[str, Any]] = None, 
+
+    def _queue_send(self, payload) -> None:
+        """Queue an outgoing frame for the writer task"""
+        self._send_queue.put_nowait(payload)
+
+    async def _send_writer(self) -> None:
+        """Drain the send queue, writing every available frame per wakeup
+
+        Requests queued back-to-back are flushed in one scheduling pass,
+        amortizing event-loop wakeups when callers fire several sends in
+        quick succession.
+        """
+        queue = self._send_queue
+        try:
+            while True:
+                payload = await queue.get()
+                try:
+                    await self.websocket.send(payload)
+                finally:
+                    queue.task_done()
+                while not queue.empty():
+                    payload = queue.get_nowait()
+                    try:
+                        await self.websocket.send(payload)
+                    finally:
+                        queue.task_done()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"❌ Send writer error: {e}")
+            # Mark the client disconnected so callers fail fast instead of
+            # queueing frames nobody will send, and ack everything still
+            # queued so disconnect()'s join() terminates
+            self.connected = False
+            self._drain_queue(queue)
+
+    async def _send_request(self, message_type: str, text: str,
+                            config: Optional[Dict[str, Any]],
+                            reference_audio: Optional[bytes]) -> None:
+        """Send a request as one small JSON frame, plus one binary frame
+        for reference audio when present.
+
+        Keeping config+text in a single coalesced frame and the reference
+        blob raw avoids building a multi-MB base64 JSON string; the two
+        frames are written back-to-back without intervening work so they
+        leave in the same event-loop tick.
+        """
+        request_data = self._request_template
+        request_data["type"] = message_type
+        data = request_data["data"]
+        data["text"] = text
+        data["config"] = config or DEFAULT_CONFIG
+        if reference_audio and self.legacy_base64_reference:
+            data["reference_audio"] = _encode_reference_b64(reference_audio)
+            payload = _dumps(request_data)
+            data.pop("reference_audio")
+            self._queue_send(payload)
+        elif reference_audio:
+            data["reference_audio_binary"] = True
+            payload = _dumps(request_data)
+            data.pop("reference_audio_binary")
+            # Both frames are queued without yielding in between, so the
+            # writer flushes them adjacently in one pass
+            self._queue_send(payload)
+            self._queue_send(reference_audio)
+        else:
+            self._queue_send(_dumps(request_data))
+
+    async def send_tts_request(self, text: str, config: Optional[Dict[str, Any]] = None,
                              reference_audio: Optional[bytes] = None) -> Optional[bytes]:
         """Send TTS request and get complete audio"""
         if not self.connected or not self.websocket:
             raise ConnectionError("Not connected to server")
-        
-        # Prepare request
-        request_data = {
-            "type": MESSAGE_TYPES["TTS_REQUEST"],
-            "data": {
-                "text": text,
-                "config": config or DEFAULT_CONFIG
-            }
-        }
-        
-        # Add reference audio if provided
-        if reference_audio:
-            request_data["data"]["reference_audio"] = base64.b64encode(reference_audio).decode('utf-8')
-        
-        # Send request
-        await self.websocket.send(json.dumps(request_data))
+
+        await self._send_request(TTS_REQUEST, text, config, reference_audio)
         logger.info(f"📤 Sent TTS request: {len(text)} characters")
-        
+
         # Wait for response
         response = await self.websocket.recv()
-        data = json.loads(response)
-        
-        if data["type"] == MESSAGE_TYPES["TTS_RESPONSE"]:
+        data = _loads(response)
+
+        if data["type"] == TTS_RESPONSE:
             response_data = data["data"]
             if response_data["status"] == "success":
-                # Decode audio
-                audio_b64 = response_data["audio"]
-                audio_bytes = base64.b64decode(audio_b64)
+                if response_data.get("binary"):
+                    # Audio follows as a raw binary frame - no base64 decode needed
+                    audio_bytes = await self.websocket.recv()
+                else:
+                    # Legacy base64 payload embedded in the JSON response;
+                    # a2b_base64 is the thin C decoder under base64.b64decode
+                    audio_bytes = binascii.a2b_base64(response_data["audio"])
                 logger.info(f"✅ Received audio: {len(audio_bytes)} bytes")
                 return audio_bytes
             else:
@@ -87,65 +351,159 @@ class KaniTTSClient:
     
     async def stream_tts_request(self, text: str, config: Optional[Dict[str, Any]] = None,
                                 reference_audio: Optional[bytes] = None,
-                                chunk_callback: Optional[Callable[[bytes, Dict[str, Any]], None]] = None) -> bool:
-        """Send streaming TTS request and handle chunks"""
+                                chunk_callback: Optional[Callable[[bytes, Dict[str, Any]], None]] = None,
+                                sink: Optional[BinaryIO] = None) -> bool:
+        """Send streaming TTS request and handle chunks
+
+        Chunks are passed to chunk_callback and/or written straight to sink
+        (a pre-opened binary writer); writing via sink avoids accumulating a
+        list of bytes objects when the consumer just wants a file.
+        """
         if not self.connected or not self.websocket:
             raise ConnectionError("Not connected to server")
         
-        # Prepare request
-        request_data = {
-            "type": MESSAGE_TYPES["TTS_STREAM_REQUEST"],
-            "data": {
-                "text": text,
-                "config": config or DEFAULT_CONFIG
-            }
-        }
-        
-        # Add reference audio if provided
-        if reference_audio:
-            request_data["data"]["reference_audio"] = base64.b64encode(reference_audio).decode('utf-8')
-        
-        # Send request
-        await self.websocket.send(json.dumps(request_data))
+        await self._send_request(TTS_STREAM_REQUEST, text, config, reference_audio)
         logger.info(f"📤 Sent streaming TTS request: {len(text)} characters")
-        
-        # Handle streaming responses
+
+        # Chunks are handed to the callback through a bounded queue drained by
+        # a consumer task, so a slow callback (disk write, playback) never
+        # stalls the socket read and applies backpressure to the network.
+        chunk_queue: asyncio.Queue = asyncio.Queue(maxsize=64)
+        consumer: Optional[asyncio.Task] = None
+        if chunk_callback is not None or sink is not None:
+            consumer = asyncio.create_task(self._consume_chunks(chunk_queue, chunk_callback, sink))
+
+        # Handle streaming responses. Audio may arrive either embedded as
+        # base64 in the JSON chunk (legacy) or as a raw binary frame announced
+        # by the preceding JSON metadata frame - binary skips base64 entirely.
+        # Hot names are bound to locals so the per-chunk loop skips repeated
+        # global and dict lookups.
+        loads = _loads
+        a2b_base64 = binascii.a2b_base64
+        chunk_type: str = TTS_STREAM_CHUNK
+        batch_type: str = TTS_STREAM_CHUNK_BATCH
+        complete_type: str = TTS_STREAM_COMPLETE
+        response_type: str = TTS_RESPONSE
+        # A dict for single chunks, a list of dicts for batch frames
+        pending_metadata: Optional[Any] = None
+        success = False
         try:
             async for message in self.websocket:
-                data = json.loads(message)
-                
-                if data["type"] == MESSAGE_TYPES["TTS_STREAM_CHUNK"]:
+                if isinstance(message, bytes) and pending_metadata is not None:
+                    # Binary audio frame paired with the previous metadata frame
+                    metadata = pending_metadata
+                    pending_metadata = None
+
+                    if isinstance(metadata, list):
+                        # Batch frame: split by the per-chunk byte sizes
+                        offset = 0
+                        for chunk_meta in metadata:
+                            size = chunk_meta["chunk_size"]
+                            piece = message[offset:offset + size]
+                            offset += size
+                            if consumer is not None:
+                                await chunk_queue.put((piece, chunk_meta))
+                        logger.info(f"📦 Received batch: {len(metadata)} chunks, {len(message)} bytes")
+                        continue
+
+                    logger.info(f"📦 Received chunk: {len(message)} bytes ({metadata['duration']:.2f}s)")
+
+                    if consumer is not None:
+                        await chunk_queue.put((message, metadata))
+                    continue
+
+                data = loads(message)
+
+                if data["type"] == chunk_type:
                     # Handle audio chunk
                     chunk_data = data["data"]
                     if chunk_data["status"] == "streaming":
+                        if chunk_data.get("binary"):
+                            # Audio follows as a raw binary frame
+                            pending_metadata = chunk_data["metadata"]
+                            continue
+
                         # Decode audio chunk
                         audio_b64 = chunk_data["audio"]
-                        audio_bytes = base64.b64decode(audio_b64)
+                        audio_bytes = a2b_base64(audio_b64)
                         metadata = chunk_data["metadata"]
-                        
+
                         logger.info(f"📦 Received chunk: {len(audio_bytes)} bytes ({metadata['duration']:.2f}s)")
-                        
-                        # Call callback if provided
-                        if chunk_callback:
-                            chunk_callback(audio_bytes, metadata)
-                
-                elif data["type"] == MESSAGE_TYPES["TTS_STREAM_COMPLETE"]:
+
+                        if consumer is not None:
+                            await chunk_queue.put((audio_bytes, metadata))
+
+                elif data["type"] == batch_type:
+                    # Several chunks coalesced into one frame; the metadata
+                    # list carries per-chunk byte sizes for splitting
+                    chunk_data = data["data"]
+                    if chunk_data["status"] == "streaming":
+                        if chunk_data.get("binary"):
+                            # Batch audio follows as one raw binary frame
+                            pending_metadata = chunk_data["metadata"]
+                            continue
+
+                        blob = a2b_base64(chunk_data["audio"])
+                        offset = 0
+                        for metadata in chunk_data["metadata"]:
+                            size = metadata["chunk_size"]
+                            piece = blob[offset:offset + size]
+                            offset += size
+                            if consumer is not None:
+                                await chunk_queue.put((piece, metadata))
+                        logger.info(f"📦 Received batch: {len(chunk_data['metadata'])} chunks, {len(blob)} bytes")
+
+                elif data["type"] == complete_type:
                     # Streaming completed
                     logger.info("✅ Streaming completed")
-                    return True
-                
-                elif data["type"] == MESSAGE_TYPES["TTS_RESPONSE"]:
+                    success = True
+                    break
+
+                elif data["type"] == response_type:
                     # Error response
                     response_data = data["data"]
                     if response_data["status"] == "error":
                         raise Exception(f"Streaming error: {response_data['message']}")
-        
+
         except websockets.exceptions.ConnectionClosed:
             logger.error("❌ Connection closed during streaming")
-            return False
         except Exception as e:
             logger.error(f"❌ Streaming error: {e}")
-            return False
+        finally:
+            if consumer is not None:
+                # Sentinel lets the consumer finish the remaining chunks
+                await chunk_queue.put(None)
+                await consumer
+
+        return success
+
+    @staticmethod
+    async def _consume_chunks(chunk_queue: asyncio.Queue,
+                              chunk_callback: Optional[Callable[[bytes, Dict[str, Any]], Any]],
+                              sink: Optional[BinaryIO] = None) -> None:
+        """Drain queued audio chunks and run the callback off the recv loop
+
+        Callback and sink errors are logged rather than raised: the task
+        must keep draining until the sentinel, or the recv loop would block
+        forever on a full queue and stream_tts_request would stop returning
+        a plain bool.
+        """
+        is_async = chunk_callback is not None and asyncio.iscoroutinefunction(chunk_callback)
+        while True:
+            item = await chunk_queue.get()
+            if item is None:
+                break
+            audio_bytes, metadata = item
+            try:
+                if sink is not None:
+                    sink.write(audio_bytes)
+                if chunk_callback is not None:
+                    if is_async:
+                        await chunk_callback(audio_bytes, metadata)
+                    else:
+                        chunk_callback(audio_bytes, metadata)
+            except Exception as e:
+                logger.error(f"❌ Chunk consumer error: {e}")
     
     async def ping(self) -> bool:
         """Send ping to check server health"""
@@ -153,16 +511,12 @@ class KaniTTSClient:
             return False
         
         try:
-            ping_data = {
-                "type": MESSAGE_TYPES["PING"],
-                "data": {}
-            }
-            await self.websocket.send(json.dumps(ping_data))
+            self._queue_send(self._ping_bytes)
             
             response = await self.websocket.recv()
-            data = json.loads(response)
+            data = _loads(response)
             
-            if data["type"] == MESSAGE_TYPES["PONG"]:
+            if data["type"] == PONG:
                 logger.info("🏓 Server is alive")
                 return True
             else:
@@ -178,7 +532,20 @@ class SpanishAITTSIntegration:
     def __init__(self, tts_host: str = WEBSOCKET_HOST, tts_port: int = WEBSOCKET_PORT):
         self.tts_client = KaniTTSClient(tts_host, tts_port)
         self.connected = False
-        
+        # One long-lived connection is shared across calls; the lock
+        # serializes requests on it and _ensure_connected transparently
+        # reconnects if the link dropped, amortizing the TCP+WS handshake
+        self._lock = asyncio.Lock()
+        self._max_reconnect_attempts = 5
+        # Spanish-optimized defaults merged once; per-call configs are a
+        # single copy+update instead of rebuilding the full merge each time
+        self._base_config: Dict[str, Any] = {
+            **DEFAULT_CONFIG,
+            "language": "spanish",
+            "emotion": "friendly",
+            "speed": 1.0
+        }
+
     async def initialize(self) -> bool:
         """Initialize TTS connection"""
         self.connected = await self.tts_client.connect()
@@ -187,23 +554,41 @@ class SpanishAITTSIntegration:
             health_check = await self.tts_client.ping()
             return health_check
         return False
-    
+
+    async def _ensure_connected(self) -> bool:
+        """Reuse the live connection, reconnecting with jittered backoff
+
+        A ping verifies the existing socket is still usable; on failure the
+        connection is re-established with exponential backoff plus jitter so
+        a restarting server is not hammered in lockstep.
+        """
+        if self.connected and await self.tts_client.ping():
+            return True
+
+        self.connected = False
+        for attempt in range(self._max_reconnect_attempts):
+            if await self.tts_client.connect() and await self.tts_client.ping():
+                self.connected = True
+                return True
+            backoff = min(30, 2 ** attempt) + random.random()
+            logger.warning(f"Reconnect attempt {attempt + 1} failed, retrying in {backoff:.1f}s")
+            await asyncio.sleep(backoff)
+        return False
+
     async def generate_speech(self, text: str, voice_config: Optional[Dict[str, Any]] = None) -> Optional[bytes]:
         """Generate speech for Spanish text"""
-        if not self.connected:
-            await self.initialize()
-        
+
         # Spanish-optimized configuration
-        spanish_config = {
-            **DEFAULT_CONFIG,
-            "language": "spanish",
-            "emotion": voice_config.get("emotion", "friendly") if voice_config else "friendly",
-            "speed": voice_config.get("speed", 1.0) if voice_config else 1.0,
-            **voice_config or {}
-        }
+        spanish_config = self._base_config.copy()
+        if voice_config:
+            spanish_config.update(voice_config)
         
         try:
-            audio_data = await self.tts_client.send_tts_request(text, spanish_config)
+            async with self._lock:
+                if not await self._ensure_connected():
+                    logger.error("Speech generation failed: could not reach TTS server")
+                    return None
+                audio_data = await self.tts_client.send_tts_request(text, spanish_config)
             return audio_data
         except Exception as e:
             logger.error(f"Speech generation failed: {e}")
@@ -212,20 +597,18 @@ class SpanishAITTSIntegration:
     async def stream_speech(self, text: str, voice_config: Optional[Dict[str, Any]] = None,
                           on_chunk: Optional[Callable[[bytes, Dict[str, Any]], None]] = None) -> bool:
         """Stream speech generation for real-time playback"""
-        if not self.connected:
-            await self.initialize()
-        
+
         # Spanish-optimized configuration
-        spanish_config = {
-            **DEFAULT_CONFIG,
-            "language": "spanish",
-            "emotion": voice_config.get("emotion", "friendly") if voice_config else "friendly",
-            "speed": voice_config.get("speed", 1.0) if voice_config else 1.0,
-            **voice_config or {}
-        }
+        spanish_config = self._base_config.copy()
+        if voice_config:
+            spanish_config.update(voice_config)
         
         try:
-            success = await self.tts_client.stream_tts_request(text, spanish_config, chunk_callback=on_chunk)
+            async with self._lock:
+                if not await self._ensure_connected():
+                    logger.error("Speech streaming failed: could not reach TTS server")
+                    return False
+                success = await self.tts_client.stream_tts_request(text, spanish_config, chunk_callback=on_chunk)
             return success
         except Exception as e:
             logger.error(f"Speech streaming failed: {e}")
@@ -257,9 +640,8 @@ async def test_client():
             audio_data = await client.send_tts_request(spanish_text)
             
             if audio_data:
-                # Save audio to file
-                with open("test_output.wav", "wb") as f:
-                    f.write(audio_data)
+                # Save audio to file in one write call
+                Path("test_output.wav").write_bytes(audio_data)
                 print("✅ Audio saved to test_output.wav")
             
             # Test streaming
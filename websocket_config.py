@@ -1,34 +1,57 @@
 """WebSocket server configuration for Kani TTS"""
 
+import enum
+from dataclasses import dataclass, asdict
+
 # WebSocket server settings
 WEBSOCKET_HOST = "localhost"
 WEBSOCKET_PORT = 8001
 WEBSOCKET_PING_INTERVAL = 20
 WEBSOCKET_PING_TIMEOUT = 10
 
-# Message types
-MESSAGE_TYPES = {
-    "TTS_REQUEST": "tts_request",
-    "TTS_STREAM_REQUEST": "tts_stream_request", 
-    "TTS_RESPONSE": "tts_response",
-    "TTS_STREAM_CHUNK": "tts_stream_chunk",
-    "TTS_STREAM_COMPLETE": "tts_stream_complete",
-    "PING": "ping",
-    "PONG": "pong"
-}
+# Message types; members are str subclasses, so they compare equal to the
+# wire strings and serialize as plain JSON strings
+class MsgType(str, enum.Enum):
+    TTS_REQUEST = "tts_request"
+    TTS_STREAM_REQUEST = "tts_stream_request"
+    TTS_RESPONSE = "tts_response"
+    TTS_STREAM_CHUNK = "tts_stream_chunk"
+    TTS_STREAM_CHUNK_BATCH = "tts_stream_chunk_batch"
+    TTS_STREAM_COMPLETE = "tts_stream_complete"
+    PING = "ping"
+    PONG = "pong"
 
-# Default TTS configuration
-DEFAULT_CONFIG = {
-    "temperature": 0.6,
-    "max_tokens": 1200,
-    "top_p": 0.95,
-    "chunk_size": 25,
-    "lookback_frames": 15,
-    "language": "spanish",
-    "emotion": "neutral",
-    "speed": 1.0,
-    "voice_id": "default"
-}
+
+# Plain-string aliases stay the cheapest form for hot compare sites
+TTS_REQUEST = MsgType.TTS_REQUEST.value
+TTS_STREAM_REQUEST = MsgType.TTS_STREAM_REQUEST.value
+TTS_RESPONSE = MsgType.TTS_RESPONSE.value
+TTS_STREAM_CHUNK = MsgType.TTS_STREAM_CHUNK.value
+TTS_STREAM_CHUNK_BATCH = MsgType.TTS_STREAM_CHUNK_BATCH.value
+TTS_STREAM_COMPLETE = MsgType.TTS_STREAM_COMPLETE.value
+PING = MsgType.PING.value
+PONG = MsgType.PONG.value
+
+# Kept for backwards compatibility with callers that index by name
+MESSAGE_TYPES = {member.name: member.value for member in MsgType}
+
+# Default TTS configuration; frozen+slots makes instances immutable with
+# C-slot attribute access instead of per-access dict probes
+@dataclass(frozen=True, slots=True)
+class DefaultTTSConfig:
+    temperature: float = 0.6
+    max_tokens: int = 1200
+    top_p: float = 0.95
+    chunk_size: int = 25
+    lookback_frames: int = 15
+    language: str = "spanish"
+    emotion: str = "neutral"
+    speed: float = 1.0
+    voice_id: str = "default"
+
+
+# Serialized once at import; callers must treat this dict as read-only
+DEFAULT_CONFIG = asdict(DefaultTTSConfig())
 
 # Supported languages
 SUPPORTED_LANGUAGES = [
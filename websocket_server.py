@@ -3,22 +3,46 @@
 import asyncio
 import json
 import base64
-import io
 import struct
 import time
-import queue
-import threading
+from dataclasses import dataclass
+from functools import lru_cache
 from typing import Dict, Any, Optional
 import numpy as np
-from scipy.io.wavfile import write as wav_write
 import websockets
 from websockets.server import WebSocketServerProtocol
 import logging
 
+# orjson serializes straight to bytes 3-10x faster than stdlib json;
+# websockets sends bytes without an extra str->bytes encode. Fall back to
+# stdlib json if unavailable.
+try:
+    import orjson
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj):
+        return json.dumps(obj).encode("utf-8")
+    _loads = json.loads
+
+# pybase64 binds aklomp/libbase64, which encodes with SIMD (AVX2/NEON) at
+# roughly memcpy speed - an order of magnitude faster than the stdlib on
+# audio-sized buffers. Fall back to stdlib base64 if unavailable.
+try:
+    import pybase64
+    _b64encode = pybase64.b64encode
+except ImportError:
+    _b64encode = base64.b64encode
+
 from audio import LLMAudioPlayer, StreamingAudioWriter
 from generation import TTSGenerator
 from config import CHUNK_SIZE, LOOKBACK_FRAMES, TEMPERATURE, TOP_P, MAX_TOKENS, SAMPLE_RATE
 
+# Duration arithmetic fires per chunk on the streaming path; multiplying
+# by a precomputed inverse is cheaper than dividing every time
+_INV_SR = 1.0 / SAMPLE_RATE
+_INV_SR_BYTES = 1.0 / (SAMPLE_RATE * 2)  # 16-bit mono: 2 bytes per sample
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -28,18 +52,41 @@ generator = None
 player = None
 
 
+@dataclass(frozen=True, slots=True)
 class TTSConfig:
     """Configuration for TTS generation"""
-    def __init__(self, data: Dict[str, Any]):
-        self.temperature = data.get("temperature", TEMPERATURE)
-        self.max_tokens = data.get("max_tokens", MAX_TOKENS)
-        self.top_p = data.get("top_p", TOP_P)
-        self.chunk_size = data.get("chunk_size", CHUNK_SIZE)
-        self.lookback_frames = data.get("lookback_frames", LOOKBACK_FRAMES)
-        self.language = data.get("language", "spanish")
-        self.emotion = data.get("emotion", "neutral")
-        self.speed = data.get("speed", 1.0)
-        self.voice_id = data.get("voice_id", "default")
+    temperature: float = TEMPERATURE
+    max_tokens: int = MAX_TOKENS
+    top_p: float = TOP_P
+    chunk_size: int = CHUNK_SIZE
+    lookback_frames: int = LOOKBACK_FRAMES
+    language: str = "spanish"
+    emotion: str = "neutral"
+    speed: float = 1.0
+    voice_id: str = "default"
+
+
+@lru_cache(maxsize=1024)
+def _make_config(items: tuple) -> TTSConfig:
+    """Build a TTSConfig from a sorted (key, value) tuple.
+
+    Clients usually send the same config on every request, so repeated
+    requests hit the cache and get the existing frozen instance back
+    instead of re-running nine dict lookups.
+    """
+    return TTSConfig(**{k: v for k, v in items if k in _CONFIG_FIELDS})
+
+
+_CONFIG_FIELDS = frozenset(TTSConfig.__dataclass_fields__)
+
+
+def _config_from_data(config_data: Dict[str, Any]) -> TTSConfig:
+    """Resolve request config data to a (usually cached) TTSConfig"""
+    try:
+        return _make_config(tuple(sorted(config_data.items())))
+    except TypeError:
+        # Unhashable values (e.g. nested containers) skip the cache
+        return TTSConfig(**{k: v for k, v in config_data.items() if k in _CONFIG_FIELDS})
 
 
 class WebSocketTTSHandler:
@@ -49,7 +96,45 @@ class WebSocketTTSHandler:
         self.generator = None
         self.player = None
         self.initialized = False
-    
+        # Writers are pooled per (chunk_size, lookback_frames) and reset
+        # between requests, so repeated short utterances reuse the same
+        # queues and lists instead of reallocating them every call
+        self._writer_pool: Dict[tuple, StreamingAudioWriter] = {}
+
+    def _get_writer(self, config: "TTSConfig") -> StreamingAudioWriter:
+        """Check a writer out of the pool, resetting it for reuse.
+
+        The writer is popped while in use so two concurrent requests with
+        the same key never share one (reset() would clear state under the
+        other request's decoder thread); a fresh writer is built when the
+        pooled one is already checked out. _return_writer puts it back.
+        """
+        key = (config.chunk_size, config.lookback_frames)
+        writer = self._writer_pool.pop(key, None)
+        if writer is None:
+            writer = StreamingAudioWriter(
+                self.player,
+                output_file=None,
+                chunk_size=config.chunk_size,
+                lookback_frames=config.lookback_frames,
+                # int16 at production time: every downstream stage (arena
+                # copy, batch concat, socket send) moves half the bytes
+                output_dtype=np.int16
+            )
+        else:
+            writer.reset()
+        return writer
+
+    def _return_writer(self, writer: StreamingAudioWriter) -> None:
+        """Return a finalized writer to the pool.
+
+        Only call after finalize() has joined the decoder thread. If a
+        concurrent request already returned a writer for this key, the
+        extra one is simply dropped.
+        """
+        key = (writer.chunk_size, writer.lookback_frames)
+        self._writer_pool.setdefault(key, writer)
+
     async def initialize(self):
         """Initialize TTS models"""
         if not self.initialized:
@@ -65,29 +150,34 @@ class WebSocketTTSHandler:
             data = message.get("data", {})
             text = data.get("text", "")
             config_data = data.get("config", {})
-            reference_audio = data.get("reference_audio")
-            
+            reference_audio = await self._receive_reference_audio(websocket, data)
+
             if not text:
                 await self._send_error(websocket, "No text provided")
                 return
-            
-            config = TTSConfig(config_data)
-            
+
+            config = _config_from_data(config_data)
+
             # Initialize models if not already done
             await self.initialize()
-            
+
             # Generate audio
             audio_data = await self._generate_audio(text, config, reference_audio)
-            
+
+            # Encoding a multi-MB WAV blocks the loop for tens of ms even
+            # with SIMD base64; run it on a worker thread so other clients
+            # keep streaming while this response is prepared
+            audio_b64 = (await asyncio.to_thread(_b64encode, audio_data)).decode('ascii')
+
             # Send response
             response = {
                 "type": "tts_response",
                 "data": {
-                    "audio": base64.b64encode(audio_data).decode('utf-8'),
+                    "audio": audio_b64,
                     "status": "success",
                     "message": "Audio generated successfully",
                     "metadata": {
-                        "duration": len(audio_data) / (SAMPLE_RATE * 2),  # 16-bit audio
+                        "duration": len(audio_data) * _INV_SR_BYTES,  # 16-bit audio
                         "sample_rate": SAMPLE_RATE,
                         "channels": 1,
                         "language": config.language,
@@ -97,7 +187,7 @@ class WebSocketTTSHandler:
                 }
             }
             
-            await websocket.send(json.dumps(response))
+            await websocket.send(_dumps(response))
             logger.info(f"✅ Sent audio response: {len(audio_data)} bytes")
             
         except Exception as e:
@@ -110,17 +200,17 @@ class WebSocketTTSHandler:
             data = message.get("data", {})
             text = data.get("text", "")
             config_data = data.get("config", {})
-            reference_audio = data.get("reference_audio")
-            
+            reference_audio = await self._receive_reference_audio(websocket, data)
+
             if not text:
                 await self._send_error(websocket, "No text provided")
                 return
-            
-            config = TTSConfig(config_data)
-            
+
+            config = _config_from_data(config_data)
+
             # Initialize models if not already done
             await self.initialize()
-            
+
             # Start streaming generation
             await self._stream_audio(websocket, text, config, reference_audio)
             
@@ -128,120 +218,209 @@ class WebSocketTTSHandler:
             logger.error(f"Error handling streaming request: {e}")
             await self._send_error(websocket, str(e))
     
-    async def _generate_audio(self, text: str, config: TTSConfig, reference_audio: Optional[str] = None) -> bytes:
+    async def _receive_reference_audio(self, websocket: WebSocketServerProtocol, data: Dict[str, Any]) -> Optional[bytes]:
+        """Get reference audio for a request, if any.
+
+        New clients announce reference audio with "reference_audio_binary" and
+        send the raw bytes as the next binary frame; legacy clients embed it as
+        base64 in the JSON request.
+        """
+        if data.get("reference_audio_binary"):
+            frame = await websocket.recv()
+            if isinstance(frame, bytes):
+                return frame
+            raise ValueError("Expected binary reference audio frame")
+
+        reference_audio = data.get("reference_audio")
+        if reference_audio:
+            return base64.b64decode(reference_audio)
+        return None
+
+    async def _generate_audio(self, text: str, config: TTSConfig, reference_audio: Optional[bytes] = None) -> bytes:
         """Generate complete audio file"""
-        # Create audio writer
-        audio_writer = StreamingAudioWriter(
-            self.player,
-            output_file=None,  # We won't write to file
-            chunk_size=config.chunk_size,
-            lookback_frames=config.lookback_frames
-        )
-        audio_writer.start()
-        
-        # Generate speech
-        result = self.generator.generate(
-            text,
-            audio_writer,
-            max_tokens=config.max_tokens
-        )
-        
-        # Finalize and get audio
-        audio_writer.finalize()
-        
-        if not audio_writer.audio_chunks:
-            raise Exception("No audio generated")
-        
-        # Concatenate all chunks
-        full_audio = np.concatenate(audio_writer.audio_chunks)
-        
-        # Convert to WAV bytes
-        wav_buffer = io.BytesIO()
-        wav_write(wav_buffer, SAMPLE_RATE, full_audio)
-        wav_buffer.seek(0)
-        
-        return wav_buffer.read()
-    
-    async def _stream_audio(self, websocket: WebSocketServerProtocol, text: str, config: TTSConfig, reference_audio: Optional[str] = None) -> None:
-        """Stream audio chunks as they're generated"""
-        chunk_queue = queue.Queue()
-        
-        # Create a custom list wrapper that pushes chunks to queue
-        class ChunkList(list):
-            def append(self, chunk):
-                super().append(chunk)
-                chunk_queue.put(("chunk", chunk))
-        
-        audio_writer = StreamingAudioWriter(
-            self.player,
-            output_file=None,
-            chunk_size=config.chunk_size,
-            lookback_frames=config.lookback_frames
-        )
-        
-        # Replace audio_chunks list with our custom one
-        audio_writer.audio_chunks = ChunkList()
-        
-        # Start generation in background thread
-        def generate():
+        audio_writer = self._get_writer(config)
+
+        # Decoded chunks are copied straight into a pre-sized arena from the
+        # decoder thread instead of accumulating in a list, so there is no
+        # final concatenate pass and peak memory stays at one buffer. The
+        # capacity bound comes from the token budget: 4 tokens per codec
+        # frame, 1764 samples per frame at 22050 Hz / 12.5 fps. The writer
+        # emits int16 already, so the arena holds the final PCM.
+        samples_per_frame = int(SAMPLE_RATE / 12.5)
+        capacity = (config.max_tokens // 4 + 1) * samples_per_frame
+        arena = np.empty(capacity, dtype=np.int16)
+        cursor = 0
+
+        def on_chunk(chunk: np.ndarray) -> None:
+            nonlocal arena, capacity, cursor
+            end = cursor + len(chunk)
+            if end > capacity:
+                # Should not happen within the token budget; grow defensively
+                capacity = max(capacity * 2, end)
+                arena = np.resize(arena, capacity)
+            arena[cursor:end] = chunk
+            cursor = end
+
+        audio_writer.on_chunk = on_chunk
+
+        # Generation is synchronous and long-running; push the whole
+        # start/generate/finalize sequence onto a worker thread so the
+        # event loop keeps serving other connections meanwhile
+        def run_generation():
+            audio_writer.start()
             try:
-                audio_writer.start()
                 self.generator.generate(
                     text,
                     audio_writer,
                     max_tokens=config.max_tokens
                 )
+            finally:
+                # Always join the decoder thread so the writer is idle
+                # before it goes back to the pool
                 audio_writer.finalize()
-                chunk_queue.put(("done", None))  # Signal completion
+
+        # Safe to read the arena once finalize has joined the decoder thread
+        try:
+            await asyncio.to_thread(run_generation)
+        finally:
+            self._return_writer(audio_writer)
+
+        if cursor == 0:
+            raise Exception("No audio generated")
+
+        full_audio = arena[:cursor]
+
+        # The format is fixed (16-bit mono PCM), so the 44-byte RIFF header
+        # is packed by hand and prepended to the raw samples - one pass over
+        # the audio instead of scipy's buffer round-trip and dtype checks
+        nbytes = full_audio.nbytes
+        header = struct.pack(
+            '<4sI4s4sIHHIIHH4sI',
+            b'RIFF', 36 + nbytes, b'WAVE',
+            b'fmt ', 16, 1, 1, SAMPLE_RATE, SAMPLE_RATE * 2, 2, 16,
+            b'data', nbytes
+        )
+        return header + full_audio.tobytes()
+    
+    async def _stream_audio(self, websocket: WebSocketServerProtocol, text: str, config: TTSConfig, reference_audio: Optional[bytes] = None) -> None:
+        """Stream audio chunks as they're generated"""
+        # Generation runs on a worker thread; chunks cross into the event
+        # loop via call_soon_threadsafe so the coroutine below never blocks
+        # the loop waiting on a synchronous queue
+        loop = asyncio.get_running_loop()
+        # Bounded so a slow client applies backpressure: once the queue
+        # fills, the decoder thread blocks in enqueue() and generation
+        # pauses instead of buffering unbounded float32 audio in RAM
+        chunk_queue: asyncio.Queue = asyncio.Queue(maxsize=8)
+
+        def enqueue(item):
+            """Push an item from the decoder thread, blocking while full"""
+            asyncio.run_coroutine_threadsafe(chunk_queue.put(item), loop).result()
+
+        audio_writer = self._get_writer(config)
+        # The writer invokes on_chunk from its decoder thread for each
+        # decoded chunk
+        audio_writer.on_chunk = lambda chunk: enqueue(("chunk", chunk))
+        
+        # Start generation in a worker thread
+        def generate():
+            try:
+                audio_writer.start()
+                try:
+                    self.generator.generate(
+                        text,
+                        audio_writer,
+                        max_tokens=config.max_tokens
+                    )
+                finally:
+                    # Always join the decoder thread so the writer is idle
+                    # before it goes back to the pool
+                    audio_writer.finalize()
+                enqueue(("done", None))  # Signal completion
             except Exception as e:
                 logger.error(f"Generation error: {e}")
-                chunk_queue.put(("error", str(e)))
-        
-        gen_thread = threading.Thread(target=generate)
-        gen_thread.start()
+                enqueue(("error", str(e)))
+
+        gen_task = asyncio.create_task(asyncio.to_thread(generate))
         
-        # Stream chunks as they arrive
+        # Stream chunks as they arrive. Whatever is already queued when a
+        # chunk comes off rides along in the same frame, so a consumer that
+        # briefly fell behind catches up with one batched send instead of a
+        # burst of tiny frames.
+        pending_msg = None
         try:
             while True:
                 try:
-                    msg_type, data = chunk_queue.get(timeout=30)  # 30s timeout
-                    
+                    if pending_msg is not None:
+                        msg_type, data = pending_msg
+                        pending_msg = None
+                    else:
+                        msg_type, data = await asyncio.wait_for(chunk_queue.get(), timeout=30)
+
                     if msg_type == "chunk":
-                        # Convert numpy array to int16 PCM
-                        pcm_data = (data * 32767).astype(np.int16)
-                        chunk_bytes = pcm_data.tobytes()
-                        
-                        # Encode as base64
-                        audio_b64 = base64.b64encode(chunk_bytes).decode('utf-8')
-                        
-                        # Send streaming chunk
-                        response = {
-                            "type": "tts_stream_chunk",
-                            "data": {
-                                "audio": audio_b64,
-                                "status": "streaming",
-                                "metadata": {
-                                    "chunk_size": len(chunk_bytes),
-                                    "duration": len(data) / SAMPLE_RATE,
-                                    "sample_rate": SAMPLE_RATE,
-                                    "channels": 1
+                        chunks = [data]
+                        # Drain without blocking; a terminal message ends the
+                        # batch and is handled on the next iteration
+                        while pending_msg is None:
+                            try:
+                                next_msg = chunk_queue.get_nowait()
+                            except asyncio.QueueEmpty:
+                                break
+                            if next_msg[0] == "chunk":
+                                chunks.append(next_msg[1])
+                            else:
+                                pending_msg = next_msg
+
+                        # Chunks arrive as int16 PCM already; one concatenate
+                        # covers the whole batch
+                        batch = np.concatenate(chunks) if len(chunks) > 1 else chunks[0]
+                        chunk_bytes = batch.tobytes()
+
+                        # Audio goes out as a raw binary frame right after a
+                        # small JSON metadata header ("binary": true) - no
+                        # base64 expansion, no copy of the PCM into a string
+                        if len(chunks) == 1:
+                            response = {
+                                "type": "tts_stream_chunk",
+                                "data": {
+                                    "binary": True,
+                                    "status": "streaming",
+                                    "metadata": {
+                                        "chunk_size": len(chunk_bytes),
+                                        "duration": len(data) * _INV_SR,
+                                        "sample_rate": SAMPLE_RATE,
+                                        "channels": 1
+                                    }
                                 }
                             }
-                        }
-                        
-                        await websocket.send(json.dumps(response))
-                        logger.info(f"[STREAM] Sent chunk: {len(chunk_bytes)} bytes ({len(data)/SAMPLE_RATE:.2f}s)")
-                        
-                    elif msg_type == "done":
-                        # Send completion message
-                        response = {
-                            "type": "tts_stream_complete",
-                            "data": {
-                                "status": "completed",
-                                "message": "Audio streaming completed"
+                        else:
+                            response = {
+                                "type": "tts_stream_chunk_batch",
+                                "data": {
+                                    "binary": True,
+                                    "status": "streaming",
+                                    "metadata": [
+                                        {
+                                            "chunk_size": len(chunk) * 2,  # int16
+                                            "duration": len(chunk) * _INV_SR,
+                                            "sample_rate": SAMPLE_RATE,
+                                            "channels": 1
+                                        }
+                                        for chunk in chunks
+                                    ]
+                                }
                             }
-                        }
-                        await websocket.send(json.dumps(response))
+
+                        # Both frames are sent back-to-back so the client's
+                        # header/audio pairing never interleaves with other
+                        # messages on this connection
+                        await websocket.send(_dumps(response))
+                        await websocket.send(chunk_bytes)
+                        logger.info(f"[STREAM] Sent {len(chunks)} chunk(s): {len(chunk_bytes)} bytes ({len(batch) * _INV_SR:.2f}s)")
+
+                    elif msg_type == "done":
+                        # Send the precomputed completion message
+                        await websocket.send(_STREAM_COMPLETE)
                         logger.info("✅ Streaming completed")
                         break
                         
@@ -249,12 +428,21 @@ class WebSocketTTSHandler:
                         await self._send_error(websocket, f"Generation error: {data}")
                         break
                         
-                except queue.Empty:
+                except asyncio.TimeoutError:
                     await self._send_error(websocket, "Generation timeout")
                     break
-                    
+
         finally:
-            gen_thread.join()
+            # If the loop above bailed early (send error, timeout), keep
+            # draining so a producer blocked on the full queue can finish
+            # instead of deadlocking gen_task
+            while not gen_task.done():
+                try:
+                    chunk_queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    await asyncio.sleep(0.05)
+            await gen_task
+            self._return_writer(audio_writer)
     
     async def _send_error(self, websocket: WebSocketServerProtocol, error_message: str) -> None:
         """Send error response"""
@@ -266,46 +454,71 @@ class WebSocketTTSHandler:
                 "message": error_message
             }
         }
-        await websocket.send(json.dumps(response))
+        await websocket.send(_dumps(response))
         logger.error(f"Sent error response: {error_message}")
 
 
 # Global handler instance
 tts_handler = WebSocketTTSHandler()
 
+# Static responses serialized once at import; the hot paths reuse the
+# bytes instead of rebuilding and re-encoding the same dict every time
+_PONG_INIT = _dumps({"type": "pong", "data": {"status": "alive", "tts_initialized": True}})
+_PONG_UNINIT = _dumps({"type": "pong", "data": {"status": "alive", "tts_initialized": False}})
+_STREAM_COMPLETE = _dumps({
+    "type": "tts_stream_complete",
+    "data": {
+        "status": "completed",
+        "message": "Audio streaming completed"
+    }
+})
+
+
+async def _handle_ping(websocket: WebSocketServerProtocol, data: Dict[str, Any]) -> None:
+    """Health check"""
+    await websocket.send(_PONG_INIT if tts_handler.initialized else _PONG_UNINIT)
+
+
+async def _handle_unknown(websocket: WebSocketServerProtocol, data: Dict[str, Any]) -> None:
+    await tts_handler._send_error(websocket, f"Unknown message type: {data.get('type', '')}")
+
+
+# Message dispatch table; one dict lookup replaces the if/elif chain
+HANDLERS = {
+    "tts_request": tts_handler.handle_tts_request,
+    "tts_stream_request": tts_handler.handle_streaming_request,
+    "ping": _handle_ping,
+}
+
+# A JSON envelope starts with '{' whether the frame arrived as str or bytes
+_JSON_PREFIXES = ('{', ord('{'))
+
 
 async def handle_client(websocket: WebSocketServerProtocol, path: str) -> None:
     """Handle WebSocket client connections"""
     client_addr = websocket.remote_address
     logger.info(f"🔗 New client connected: {client_addr}")
-    
+
     try:
         async for message in websocket:
             try:
-                # Parse JSON message
-                data = json.loads(message)
+                # Cheap prefilter: reject frames that cannot be a JSON
+                # envelope before paying for a parse plus exception unwind
+                if not message or message[0] not in _JSON_PREFIXES:
+                    await tts_handler._send_error(websocket, "Invalid JSON format")
+                    continue
+
+                # Parse JSON straight from whatever the frame delivered -
+                # orjson takes bytes as-is, skipping a utf-8 decode to str
+                data = _loads(message)
                 message_type = data.get("type", "")
-                
+
                 logger.info(f"📨 Received message type: {message_type}")
-                
-                if message_type == "tts_request":
-                    await tts_handler.handle_tts_request(websocket, data)
-                elif message_type == "tts_stream_request":
-                    await tts_handler.handle_streaming_request(websocket, data)
-                elif message_type == "ping":
-                    # Health check
-                    response = {
-                        "type": "pong",
-                        "data": {
-                            "status": "alive",
-                            "tts_initialized": tts_handler.initialized
-                        }
-                    }
-                    await websocket.send(json.dumps(response))
-                else:
-                    await tts_handler._send_error(websocket, f"Unknown message type: {message_type}")
-                    
-            except json.JSONDecodeError:
+
+                await HANDLERS.get(message_type, _handle_unknown)(websocket, data)
+
+            except ValueError:
+                # Covers orjson.JSONDecodeError and json.JSONDecodeError
                 await tts_handler._send_error(websocket, "Invalid JSON format")
             except Exception as e:
                 logger.error(f"Error processing message: {e}")
@@ -330,7 +543,13 @@ async def main():
         "localhost",
         8001,  # Different port from REST API
         ping_interval=20,
-        ping_timeout=10
+        ping_timeout=10,
+        # PCM audio is high-entropy, so permessage-deflate burns CPU and
+        # adds latency for almost no size win; the client disables it too
+        compression=None,
+        # 4 MB comfortably fits request JSON plus binary reference audio
+        # frames while still rejecting runaway messages
+        max_size=2**22
     )
     
     logger.info("✅ WebSocket server started on ws://localhost:8001")
@@ -344,6 +563,19 @@ async def main():
 
 
 if __name__ == "__main__":
+    # uvloop (winloop on Windows) replaces the default selector event loop
+    # with libuv, speeding up every socket send/recv on the WebSocket hot
+    # path. start_websocket_server.py does the same for the packaged entry.
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        try:
+            import winloop
+            winloop.install()
+        except ImportError:
+            pass
+
     try:
         asyncio.run(main())
     except KeyboardInterrupt: